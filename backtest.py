@@ -3,43 +3,69 @@
 """
 
 import logging
-import pandas as pd
+import orjson
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from itertools import chain
+from typing import Dict, List, Any, Optional, Tuple, Iterator, AsyncIterator
 
-from data_provider import DataProvider
+from data_provider import DataProvider, PriceBundle
+from kernels import price_stats
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# NumPy 데이터 타입을 Python 기본 타입으로 변환하는 함수
-def convert_numpy_types(obj):
-    """NumPy 데이터 타입을 Python 기본 타입으로 변환합니다."""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_numpy_types(item) for item in obj]
-    return obj
+# daily_data 한 행의 JSON 템플릿 (키 구성이 고정되어 있으므로 dict 없이 바로 생성)
+DAILY_ROW_TEMPLATE = b'{"date":"%s","open":%s,"high":%s,"low":%s,"close":%s,"volume":%s}'
+DAILY_CHUNK_SIZE = 1024  # 한 번에 직렬화하는 행 수 (스트리밍 시 메모리 상한)
 
-# Series 또는 DataFrame에서 안전하게 스칼라 값을 추출하는 헬퍼 함수
-def safe_scalar(obj):
+def _encode_values(values: np.ndarray) -> List[bytes]:
+    """배열 전체를 orjson으로 한 번에 직렬화한 뒤 원소별 JSON 숫자 바이트로 나눕니다."""
+    if len(values) == 0:
+        return []
+    return orjson.dumps(values, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1].split(b",")
+
+def _iter_daily_row_chunks(bundle: PriceBundle) -> Iterator[List[bytes]]:
+    """
+    daily_data 행 JSON을 DAILY_CHUNK_SIZE 행 단위로 생성합니다.
+    행마다 dict를 만들지 않고 칼럼별로 직렬화한 값을 행 템플릿에 채웁니다.
+    """
+    for start in range(0, len(bundle), DAILY_CHUNK_SIZE):
+        stop = start + DAILY_CHUNK_SIZE
+        dates = np.datetime_as_string(bundle.dates[start:stop], unit="D").astype("S10").tolist()
+        columns = map(_encode_values, (
+            bundle.open[start:stop],
+            bundle.high[start:stop],
+            bundle.low[start:stop],
+            bundle.close[start:stop],
+            bundle.volume[start:stop]
+        ))
+        yield [DAILY_ROW_TEMPLATE % row for row in zip(dates, *columns)]
+
+def encode_daily_data(bundle: PriceBundle) -> orjson.Fragment:
+    """
+    가격 배열 묶음을 daily_data JSON 배열로 직렬화합니다.
+    
+    Args:
+        bundle: 가격 데이터 배열 묶음
+        
+    Returns:
+        응답에 그대로 삽입되는 JSON 조각
+    """
+    rows = chain.from_iterable(_iter_daily_row_chunks(bundle))
+    return orjson.Fragment(b"[" + b",".join(rows) + b"]")
+
+def iter_daily_ndjson(bundle: PriceBundle) -> Iterator[bytes]:
     """
-    pandas Series나 numpy 배열에서 안전하게 스칼라 값을 추출합니다.
-    이미 스칼라 값이면 그대로 반환합니다.
+    daily_data를 줄 단위 JSON(NDJSON)으로 나눠 생성합니다.
+    
+    Args:
+        bundle: 가격 데이터 배열 묶음
+        
+    Returns:
+        DAILY_CHUNK_SIZE 행씩 묶은 NDJSON 바이트 이터레이터
     """
-    if isinstance(obj, pd.Series):
-        return obj.iloc[0]  # Series에서 첫 번째 값을 추출
-    elif isinstance(obj, pd.DataFrame):
-        return obj.iloc[0, 0]  # DataFrame에서 첫 번째 셀 값을 추출
-    else:
-        return obj  # 이미 스칼라 값이면 그대로 반환
+    for rows in _iter_daily_row_chunks(bundle):
+        yield b"\n".join(rows) + b"\n"
 
 class BacktestAnalyzer:
     """다양한 자산 유형에 대한 백테스팅 및 포트폴리오 분석 기능을 제공하는 클래스"""
@@ -65,6 +91,62 @@ class BacktestAnalyzer:
         Returns:
             백테스팅 결과 딕셔너리
         """
+        result, bundle = await BacktestAnalyzer._run_backtest(
+            symbol, start_date, end_date, investment_amount, asset_type
+        )
+        
+        # 일별 데이터 추가 (프론트엔드 계산용, JSON으로 미리 직렬화)
+        if bundle is not None:
+            result["daily_data"] = encode_daily_data(bundle)
+        
+        return result
+    
+    @staticmethod
+    async def stream_backtest_asset(
+        symbol: str, 
+        start_date: str, 
+        end_date: str, 
+        investment_amount: float = 1000000,
+        asset_type: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        단일 자산에 대한 백테스팅 결과를 NDJSON으로 스트리밍합니다.
+        첫 줄은 요약 결과(daily_data 제외), 이후 한 줄에 하루치 데이터가 이어집니다.
+        
+        Args:
+            symbol: 자산 심볼
+            start_date: 시작일(YYYY-MM-DD)
+            end_date: 종료일(YYYY-MM-DD)
+            investment_amount: 투자 금액 (기본값: 100만원)
+            asset_type: 자산 유형 (명시적으로 지정할 경우)
+            
+        Returns:
+            NDJSON 바이트 비동기 이터레이터
+        """
+        result, bundle = await BacktestAnalyzer._run_backtest(
+            symbol, start_date, end_date, investment_amount, asset_type
+        )
+        
+        yield orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+        
+        if bundle is not None:
+            for lines in iter_daily_ndjson(bundle):
+                yield lines
+    
+    @staticmethod
+    async def _run_backtest(
+        symbol: str, 
+        start_date: str, 
+        end_date: str, 
+        investment_amount: float,
+        asset_type: Optional[str]
+    ) -> Tuple[Dict[str, Any], Optional[PriceBundle]]:
+        """
+        백테스팅 요약 결과를 계산합니다. 일별 데이터는 호출하는 쪽에서 직렬화합니다.
+        
+        Returns:
+            (daily_data를 제외한 결과 딕셔너리, 가격 데이터 배열 묶음 - 오류 시 None) 튜플
+        """
         try:
             logger.info(f"백테스팅 데이터 요청: {symbol} ({start_date} ~ {end_date})")
             
@@ -84,15 +166,20 @@ class BacktestAnalyzer:
             result = await DataProvider.get_data(processed_symbol, start_date, end_date, asset_type)
             
             if result.get("status") != "success":
-                return result
+                return result, None
             
-            data = result["dataframe"]
+            bundle = result["bundle"]
             asset_info = result["data"]
             
+            # 가격 배열 (DataProvider에서 연속 float64 배열로 준비됨)
+            closes = bundle.close
+            start = str(bundle.dates[0])
+            end = str(bundle.dates[-1])
+            
             # 서버에서 기본 계산 수행 (기존 코드와 호환성 유지)
             # 자산 매수 시뮬레이션
-            initial_price = safe_scalar(data.iloc[0]["Close"])
-            final_price = safe_scalar(data.iloc[-1]["Close"])
+            initial_price = float(closes[0])
+            final_price = float(closes[-1])
             
             shares_bought = investment_amount / initial_price
             final_value = shares_bought * final_price
@@ -100,62 +187,34 @@ class BacktestAnalyzer:
             profit = final_value - investment_amount
             profit_percentage = (profit / investment_amount) * 100
             
-            # 일간 수익률 계산
-            data["Daily_Return"] = data["Close"].pct_change()
-            
-            # 누적 수익률 계산
-            data["Cumulative_Return"] = (1 + data["Daily_Return"]).cumprod() - 1
-            
-            # 최대 낙폭(MDD) 계산
-            cumulative_max = data["Close"].cummax()
-            drawdown = (data["Close"] - cumulative_max) / cumulative_max
-            mdd = safe_scalar(drawdown.min()) * 100
-            
-            # 수익률 통계
-            daily_returns = data["Daily_Return"].dropna()
-            volatility = safe_scalar(daily_returns.std()) * (252 ** 0.5) * 100
-            sharpe_ratio = (profit_percentage / 365 * len(data)) / volatility if volatility != 0 else 0
+            # 최대 낙폭(MDD) 및 변동성 계산
+            mdd, volatility = price_stats(closes)
+            sharpe_ratio = (profit_percentage * len(closes)) / (365 * volatility) if volatility != 0 else 0.0
             
             # 거래 시뮬레이션 (단순 매수-보유 전략)
             trade_history = [{
-                "date": data.index[0].strftime("%Y-%m-%d"),
+                "date": start,
                 "action": "매수",
                 "price": round(initial_price, 2),
                 "shares": round(shares_bought, 4),
                 "value": round(investment_amount, 2),
             }, {
-                "date": data.index[-1].strftime("%Y-%m-%d"),
+                "date": end,
                 "action": "평가",
                 "price": round(final_price, 2),
                 "shares": round(shares_bought, 4),
                 "value": round(final_value, 2),
             }]
             
-            # 일별 데이터 추가 (프론트엔드 계산용)
-            daily_data = []
-            
-            for idx in range(len(data)):
-                date_str = data.index[idx].strftime("%Y-%m-%d")
-                
-                # 필요한 가격 데이터만 추출
-                daily_data.append({
-                    "date": date_str,
-                    "open": float(safe_scalar(data.iloc[idx]["Open"])) if "Open" in data.columns else float(safe_scalar(data.iloc[idx]["Close"])),
-                    "high": float(safe_scalar(data.iloc[idx]["High"])) if "High" in data.columns else float(safe_scalar(data.iloc[idx]["Close"])),
-                    "low": float(safe_scalar(data.iloc[idx]["Low"])) if "Low" in data.columns else float(safe_scalar(data.iloc[idx]["Close"])),
-                    "close": float(safe_scalar(data.iloc[idx]["Close"])),
-                    "volume": float(safe_scalar(data.iloc[idx]["Volume"])) if "Volume" in data.columns else 0
-                })
-            
-            # 기존 결과 형식 유지하면서 일별 데이터 추가
+            # 기존 결과 형식 유지 (일별 데이터는 호출하는 쪽에서 추가)
             result = {
                 "status": "success",
                 "symbol": symbol,
                 "name": asset_info["name"],
                 "asset_type": asset_info["asset_type"],
                 "currency": currency,  # 통화 정보 추가
-                "start_date": data.index[0].strftime("%Y-%m-%d"),
-                "end_date": data.index[-1].strftime("%Y-%m-%d"),
+                "start_date": start,
+                "end_date": end,
                 "initial_investment": float(investment_amount),
                 "initial_price": round(initial_price, 2),
                 "final_price": round(final_price, 2),
@@ -166,18 +225,17 @@ class BacktestAnalyzer:
                 "max_drawdown": round(mdd, 2),
                 "volatility": round(volatility, 2),
                 "sharpe_ratio": round(sharpe_ratio, 2),
-                "trade_history": trade_history,
-                "daily_data": daily_data  # 일별 데이터 추가
+                "trade_history": trade_history
             }
             
-            # NumPy 타입 변환
-            return convert_numpy_types(result)
+            # NumPy 타입은 응답 직렬화(orjson)에서 그대로 처리
+            return result, bundle
         
         except Exception as e:
             logger.error(f"백테스팅 중 오류: {str(e)}")
             import traceback
             logger.error(traceback.format_exc())
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e)}, None
     
     @staticmethod
     def print_backtest_result(result: Dict[str, Any]) -> None:
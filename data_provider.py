@@ -3,29 +3,195 @@
 yfinance를 기본 데이터 소스로 사용합니다.
 """
 
+import os
+import json
 import asyncio
+import hashlib
 import logging
+import httpx
+import orjson
 import pandas as pd
 import numpy as np
 import yfinance as yf
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from urllib.parse import quote
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# Series 또는 DataFrame에서 안전하게 스칼라 값을 추출하는 헬퍼 함수
-def safe_scalar(obj):
+# 가격 데이터 캐시 설정 (Parquet 파일, (심볼, 시작일, 종료일) 키)
+PRICE_CACHE_DIR = os.environ.get("PRICE_CACHE_DIR", "cache")
+PRICE_CACHE_TTL = timedelta(days=1)  # 과거 구간 데이터의 캐시 유지 시간
+PRICE_CACHE_TMP_TTL = timedelta(hours=1)  # 쓰다 남은 임시 파일을 정리하기까지의 유예 시간
+KST = timezone(timedelta(hours=9))
+
+# float64로 변환해 보관하는 가격 데이터 칼럼
+# (float32는 2^24 이상의 값을 반올림하므로 원화 표시 가격/거래량이 바뀜)
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# 캐시 형식 버전 (저장 형식이 바뀌면 올려서 이전 캐시 파일을 무효화)
+PRICE_CACHE_VERSION = 2
+
+# Yahoo Finance 차트 API (yf.download 없이 비동기 HTTP로 일봉 조회)
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"}
+_http_client: Optional[httpx.AsyncClient] = None
+
+# 자산명 캐시 (심볼 -> 이름, 종료 시 JSON 파일로 저장)
+NAME_CACHE_PATH = os.path.join(PRICE_CACHE_DIR, "asset_names.json")
+_NAME_CACHE: Dict[str, str] = {}
+
+# 진행 중인 조회 작업 (같은 키의 동시 요청이 하나의 네트워크 조회를 공유)
+_inflight: Dict[tuple, asyncio.Task] = {}
+
+def _singleflight(key: tuple, factory: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+    """
+    같은 키로 진행 중인 작업이 있으면 그 결과를 함께 기다리고, 없으면 새 작업을 시작합니다.
+    한 호출자가 취소되어도 공유 작업은 취소되지 않도록 shield로 감쌉니다.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return asyncio.shield(task)
+
+class DownloadBatcher:
+    """
+    짧은 시간 창(window) 동안 들어온 yf.download 요청을 (시작일, 종료일)별로 모아
+    여러 심볼을 한 번의 yf.download 호출로 조회합니다.
+    """
+    
+    def __init__(self, window: float = 0.05):
+        """
+        Args:
+            window: 요청을 모으는 시간 (초)
+        """
+        self.window = window
+        self._pending: Dict[Tuple[str, str], Dict[str, asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def download(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        심볼 하나의 가격 데이터를 요청하고, 묶음 조회가 끝나면 해당 심볼의 DataFrame을 반환합니다.
+        
+        Args:
+            symbol: 자산 심볼
+            start_date: 시작일
+            end_date: 종료일
+            
+        Returns:
+            해당 심볼의 가격 데이터 DataFrame (칼럼은 필드 이름)
+        """
+        loop = asyncio.get_running_loop()
+        group = self._pending.setdefault((start_date, end_date), {})
+        future = group.get(symbol)
+        if future is None:
+            future = loop.create_future()
+            group[symbol] = future
+        
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+        
+        return await asyncio.shield(future)
+    
+    async def _flush_after_window(self) -> None:
+        """시간 창이 지나면 모인 요청을 기간별로 한 번씩 조회합니다."""
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        
+        await asyncio.gather(*(
+            self._download_group(start_date, end_date, futures)
+            for (start_date, end_date), futures in pending.items()
+        ))
+    
+    @staticmethod
+    async def _download_group(start_date: str, end_date: str, futures: Dict[str, asyncio.Future]) -> None:
+        """같은 기간의 심볼들을 한 번에 조회해 심볼별 결과로 나눠 전달합니다."""
+        symbols = list(futures)
+        try:
+            data = await asyncio.to_thread(
+                yf.download, 
+                " ".join(symbols), 
+                start=start_date, 
+                end=end_date,
+                progress=False,
+                auto_adjust=True,  # 수정주가 사용
+                group_by="ticker"
+            )
+            
+            for symbol, frame in DownloadBatcher._split_by_symbol(data, symbols).items():
+                if not futures[symbol].done():
+                    futures[symbol].set_result(frame)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+    
+    @staticmethod
+    def _split_by_symbol(data: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        group_by="ticker" 결과((티커, 필드) MultiIndex 칼럼)를 심볼별 DataFrame으로 나눕니다.
+        결과에 없는 심볼은 빈 DataFrame을 받습니다.
+        """
+        if not isinstance(data.columns, pd.MultiIndex):
+            # 단일 심볼이 평탄한 칼럼으로 반환된 경우
+            return {symbol: data if len(symbols) == 1 else pd.DataFrame() for symbol in symbols}
+        
+        tickers = set(data.columns.get_level_values(0))
+        frames = {}
+        for symbol in symbols:
+            # yfinance는 티커를 대문자로 정규화함
+            ticker = symbol if symbol in tickers else symbol.upper()
+            frames[symbol] = data[ticker] if ticker in tickers else pd.DataFrame()
+        return frames
+
+_download_batcher = DownloadBatcher()
+
+@dataclass(slots=True)
+class PriceBundle:
     """
-    pandas Series나 numpy 배열에서 안전하게 스칼라 값을 추출합니다.
-    이미 스칼라 값이면 그대로 반환합니다.
+    가격 데이터를 칼럼별 NumPy 배열로 묶은 구조체.
+    조회 이후에는 DataFrame 대신 이 배열들만 사용합니다.
     """
-    if isinstance(obj, pd.Series):
-        return obj.iloc[0]  # Series에서 첫 번째 값을 추출
-    elif isinstance(obj, pd.DataFrame):
-        return obj.iloc[0, 0]  # DataFrame에서 첫 번째 셀 값을 추출
-    else:
-        return obj  # 이미 스칼라 값이면 그대로 반환
+    dates: np.ndarray   # datetime64[D]
+    open: np.ndarray    # float64, 이하 동일
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.close)
+    
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame) -> "PriceBundle":
+        """
+        yfinance DataFrame에서 연속(C-contiguous) 배열 묶음을 만듭니다.
+        없는 칼럼은 종가(거래량은 0)로 채웁니다.
+        """
+        def column(name: str) -> Optional[np.ndarray]:
+            if name not in data.columns:
+                return None
+            return np.ascontiguousarray(data[name].to_numpy(dtype=np.float64))
+        
+        close = column("Close")
+        open_ = column("Open")
+        high = column("High")
+        low = column("Low")
+        volume = column("Volume")
+        
+        return cls(
+            dates=data.index.values.astype("datetime64[D]"),
+            open=close if open_ is None else open_,
+            high=close if high is None else high,
+            low=close if low is None else low,
+            close=close,
+            volume=np.zeros(len(close), dtype=np.float64) if volume is None else volume
+        )
 
 class DataProvider:
     """다양한 자산 유형의 가격 데이터를 제공하는 클래스"""
@@ -65,17 +231,17 @@ class DataProvider:
                     processed_symbol = f"{symbol}.KS"  # 기본적으로 KOSPI로 가정
             
             # 새로운 방식: yfinance.download 사용
-            data = await DataProvider._fetch_yfinance_data(processed_symbol, start_date, end_date)
+            bundle = await DataProvider._fetch_yfinance_data(processed_symbol, start_date, end_date)
             
-            if data.empty:
+            if bundle is None:
                 return {"status": "error", "error": f"자산 {symbol}의 데이터를 찾을 수 없습니다."}
             
             # 자산명 가져오기
             asset_name = await DataProvider._get_asset_name(processed_symbol, asset_type)
             
-            # 기본 정보 추출 (스칼라 값 안전하게 추출)
-            first_close = safe_scalar(data.iloc[0]["Close"])
-            last_close = safe_scalar(data.iloc[-1]["Close"])
+            # 기본 정보 추출
+            first_close = float(bundle.close[0])
+            last_close = float(bundle.close[-1])
             price_change = ((last_close - first_close) / first_close) * 100
             
             info = {
@@ -85,15 +251,15 @@ class DataProvider:
                 "current_price": round(last_close, 2),
                 "start_price": round(first_close, 2),
                 "price_change": round(price_change, 2),
-                "start_date": data.index[0].strftime("%Y-%m-%d"),
-                "end_date": data.index[-1].strftime("%Y-%m-%d"),
-                "data_points": len(data)
+                "start_date": str(bundle.dates[0]),
+                "end_date": str(bundle.dates[-1]),
+                "data_points": len(bundle)
             }
             
             return {
                 "status": "success",
                 "data": info,
-                "dataframe": data
+                "bundle": bundle
             }
         except Exception as e:
             logger.error(f"데이터 조회 중 오류: {str(e)}")
@@ -102,9 +268,28 @@ class DataProvider:
             return {"status": "error", "error": str(e)}
     
     @staticmethod
-    async def _fetch_yfinance_data(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    async def _fetch_yfinance_data(symbol: str, start_date: str, end_date: str) -> Optional[PriceBundle]:
         """
         yfinance에서 비동기적으로 가격 데이터를 가져옵니다.
+        같은 (심볼, 시작일, 종료일)에 대한 동시 요청은 하나의 조회를 공유합니다.
+        
+        Args:
+            symbol: 자산 심볼
+            start_date: 시작일
+            end_date: 종료일
+            
+        Returns:
+            가격 데이터 배열 묶음 (데이터가 없으면 None)
+        """
+        return await _singleflight(
+            ("price", symbol, start_date, end_date),
+            lambda: DataProvider._download_yfinance_data(symbol, start_date, end_date)
+        )
+    
+    @staticmethod
+    async def _download_yfinance_data(symbol: str, start_date: str, end_date: str) -> Optional[PriceBundle]:
+        """
+        캐시, Yahoo 차트 API, yf.download(묶음 조회) 순으로 가격 데이터를 가져옵니다.
         
         Args:
             symbol: 자산 심볼
@@ -112,35 +297,230 @@ class DataProvider:
             end_date: 종료일
             
         Returns:
-            가격 데이터가 포함된 DataFrame
+            가격 데이터 배열 묶음 (데이터가 없으면 None)
         """
+        cache_key = hashlib.sha1(f"v{PRICE_CACHE_VERSION}|{symbol}|{start_date}|{end_date}".encode()).hexdigest()
+        cache_path = os.path.join(PRICE_CACHE_DIR, f"{cache_key}.parquet")
+        
         try:
-            # 새로운 방식: yf.download 사용 (비동기로 처리)
-            data = await asyncio.to_thread(
-                yf.download, 
-                symbol, 
-                start=start_date, 
-                end=end_date,
-                progress=False,
-                auto_adjust=True  # 수정주가 사용
-            )
+            # 캐시에 유효한 데이터가 있으면 네트워크 요청 생략
+            cached = await asyncio.to_thread(DataProvider._read_price_cache, cache_path, end_date)
+            if cached is not None:
+                logger.info(f"캐시된 가격 데이터 사용: {symbol} ({start_date} ~ {end_date})")
+                return PriceBundle.from_dataframe(cached)
+            
+            # 차트 API로 직접 조회하고, 실패하면 yf.download 사용 (동시 요청은 여러 심볼을 묶어 한 번에 조회)
+            data = await DataProvider._fetch_chart_data(symbol, start_date, end_date)
+            if data is None:
+                data = await _download_batcher.download(symbol, start_date, end_date)
             
             # 결과 데이터프레임에 필요한 칼럼이 있는지 확인
+            # (종가가 없는 행은 제거 - 통계 커널은 NaN 없는 배열을 가정)
+            if 'Close' in data.columns:
+                data = data.dropna(subset=["Close"])
             if data.empty or 'Close' not in data.columns:
                 logger.warning(f"심볼 {symbol}에 대한 데이터를 가져올 수 없습니다.")
-                return pd.DataFrame()
+                return None
             
-            return data
+            # 가격/거래량은 원본 값을 그대로 보존하도록 float64로 저장
+            data = data.astype({column: np.float64 for column in PRICE_COLUMNS if column in data.columns})
+            
+            await asyncio.to_thread(DataProvider._write_price_cache, cache_path, data)
+            return PriceBundle.from_dataframe(data)
         except Exception as e:
             logger.error(f"yfinance 데이터 조회 오류: {str(e)}")
             import traceback
             logger.error(traceback.format_exc())  # 스택 트레이스 추가
-            return pd.DataFrame()
+            return None
+    
+    @staticmethod
+    async def _fetch_chart_data(symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """
+        Yahoo Finance 차트 API에서 일봉 데이터를 비동기로 가져옵니다.
+        yf.download(auto_adjust=True)와 같게 수정주가 비율로 OHLC를 보정합니다.
+        
+        Args:
+            symbol: 자산 심볼
+            start_date: 시작일
+            end_date: 종료일 (해당 일 미포함)
+            
+        Returns:
+            가격 데이터 DataFrame (조회 실패 시 None)
+        """
+        global _http_client
+        if _http_client is None:
+            _http_client = httpx.AsyncClient(timeout=10, headers=YAHOO_HEADERS)
+        
+        try:
+            period1 = int(datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+            period2 = int(datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+            
+            response = await _http_client.get(
+                YAHOO_CHART_URL.format(symbol=quote(symbol, safe="")),
+                params={"period1": period1, "period2": period2, "interval": "1d", "includeAdjustedClose": "true"}
+            )
+            response.raise_for_status()
+            
+            chart = orjson.loads(response.content)["chart"]["result"][0]
+            quote_data = chart["indicators"]["quote"][0]
+            
+            # 타임스탬프를 거래소 현지 날짜로 변환
+            timestamps = np.asarray(chart["timestamp"], dtype=np.int64) + chart["meta"].get("gmtoffset", 0)
+            dates = pd.DatetimeIndex(timestamps.astype("datetime64[s]").astype("datetime64[D]"), name="Date")
+            
+            # null 값은 NaN으로 변환됨
+            close = np.asarray(quote_data["close"], dtype=np.float64)
+            adjclose = np.asarray(chart["indicators"]["adjclose"][0]["adjclose"], dtype=np.float64)
+            ratio = adjclose / close
+            
+            return pd.DataFrame({
+                "Open": np.asarray(quote_data["open"], dtype=np.float64) * ratio,
+                "High": np.asarray(quote_data["high"], dtype=np.float64) * ratio,
+                "Low": np.asarray(quote_data["low"], dtype=np.float64) * ratio,
+                "Close": adjclose,
+                "Volume": np.asarray(quote_data["volume"], dtype=np.float64)
+            }, index=dates)
+        except Exception as e:
+            logger.debug(f"차트 API 조회 실패, yf.download 사용: {symbol} ({str(e)})")
+            return None
+    
+    @staticmethod
+    async def close() -> None:
+        """공유 HTTP 클라이언트를 닫습니다."""
+        global _http_client
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
+    
+    @staticmethod
+    def _read_price_cache(cache_path: str, end_date: str) -> Optional[pd.DataFrame]:
+        """
+        캐시 파일이 유효하면 가격 데이터를 읽어옵니다.
+        
+        종료일이 오늘(KST) 이후인 구간은 당일 데이터가 계속 바뀌므로 자정(KST)까지만,
+        과거 구간은 PRICE_CACHE_TTL 동안만 유효합니다.
+        
+        Args:
+            cache_path: 캐시 파일 경로
+            end_date: 종료일
+            
+        Returns:
+            캐시된 DataFrame (없거나 만료된 경우 None)
+        """
+        try:
+            mtime = os.path.getmtime(cache_path)
+        except OSError:
+            return None
+        
+        now = datetime.now(KST)
+        cached_at = datetime.fromtimestamp(mtime, KST)
+        
+        if end_date >= now.strftime("%Y-%m-%d"):
+            is_fresh = cached_at.date() == now.date()
+        else:
+            is_fresh = now - cached_at < PRICE_CACHE_TTL
+        
+        if not is_fresh:
+            # 상대 날짜 요청은 매일 새 키를 만들므로 만료된 파일은 바로 삭제
+            DataProvider._remove_cache_file(cache_path)
+            return None
+        
+        try:
+            return pd.read_parquet(cache_path, engine="pyarrow")
+        except Exception as e:
+            logger.warning(f"가격 캐시 읽기 실패: {str(e)}")
+            DataProvider._remove_cache_file(cache_path)
+            return None
+    
+    @staticmethod
+    def _write_price_cache(cache_path: str, data: pd.DataFrame) -> None:
+        """
+        가격 데이터를 캐시 파일로 저장합니다. 저장 실패는 조회 결과에 영향을 주지 않습니다.
+        
+        Args:
+            cache_path: 캐시 파일 경로
+            data: 가격 데이터
+        """
+        # 동시 요청이 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            data.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"가격 캐시 저장 실패: {str(e)}")
+            DataProvider._remove_cache_file(tmp_path)
+    
+    @staticmethod
+    def _remove_cache_file(path: str) -> None:
+        """캐시 파일을 삭제합니다. 이미 없거나 삭제할 수 없으면 무시합니다."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def purge_price_cache() -> None:
+        """
+        만료된 가격 캐시 파일과 쓰다 남은 임시 파일을 삭제합니다.
+        
+        파일만으로는 종료일을 알 수 없으므로 어떤 구간이든 확실히 만료된
+        PRICE_CACHE_TTL 이전 파일만 지웁니다 (나머지는 읽을 때 만료 여부를 확인해 삭제).
+        """
+        try:
+            entries = list(os.scandir(PRICE_CACHE_DIR))
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"가격 캐시 정리 실패: {str(e)}")
+            return
+        
+        now = datetime.now(KST).timestamp()
+        removed = 0
+        for entry in entries:
+            if entry.name.endswith(".parquet"):
+                ttl = PRICE_CACHE_TTL
+            elif entry.name.endswith(".tmp"):
+                ttl = PRICE_CACHE_TMP_TTL
+            else:
+                continue
+            
+            try:
+                if now - entry.stat().st_mtime < ttl.total_seconds():
+                    continue
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                continue
+        
+        if removed:
+            logger.info(f"만료된 가격 캐시 삭제: {removed}개")
     
     @staticmethod
     async def _get_asset_name(symbol: str, asset_type: Optional[str] = None) -> str:
         """
-        자산의 이름을 가져옵니다.
+        자산의 이름을 가져옵니다. 같은 심볼에 대한 동시 요청은 하나의 조회를 공유합니다.
+        
+        Args:
+            symbol: 자산 심볼
+            asset_type: 자산 유형
+            
+        Returns:
+            자산 이름
+        """
+        cached_name = _NAME_CACHE.get(symbol)
+        if cached_name is not None:
+            return cached_name
+        
+        return await _singleflight(
+            ("name", symbol, asset_type),
+            lambda: DataProvider._lookup_asset_name(symbol, asset_type)
+        )
+    
+    @staticmethod
+    async def _lookup_asset_name(symbol: str, asset_type: Optional[str] = None) -> str:
+        """
+        yfinance 티커 정보에서 자산의 이름을 조회합니다.
         
         Args:
             symbol: 자산 심볼
@@ -156,11 +536,11 @@ class DataProvider:
             # 비동기적으로 티커 정보 가져오기
             info = await asyncio.to_thread(lambda: ticker.info)
             
-            # 자산명 반환
-            if 'shortName' in info and info['shortName']:
-                return info['shortName']
-            elif 'longName' in info and info['longName']:
-                return info['longName']
+            # 자산명 반환 (조회에 성공한 이름만 캐시)
+            name = info.get('shortName') or info.get('longName')
+            if name:
+                _NAME_CACHE[symbol] = name
+                return name
             else:
                 # 자산 유형에 따라 기본 이름 제공
                 if asset_type == "stock":
@@ -173,4 +553,26 @@ class DataProvider:
                 return symbol
         except Exception as e:
             logger.debug(f"자산명 조회 실패: {str(e)}")
-            return symbol
\ No newline at end of file
+            return symbol
+    
+    @staticmethod
+    def load_name_cache() -> None:
+        """저장된 자산명 캐시 파일을 읽어옵니다."""
+        try:
+            with open(NAME_CACHE_PATH, encoding="utf-8") as f:
+                _NAME_CACHE.update(json.load(f))
+            logger.info(f"자산명 캐시 로드: {len(_NAME_CACHE)}개")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"자산명 캐시 로드 실패: {str(e)}")
+    
+    @staticmethod
+    def save_name_cache() -> None:
+        """자산명 캐시를 파일로 저장합니다."""
+        try:
+            os.makedirs(os.path.dirname(NAME_CACHE_PATH), exist_ok=True)
+            with open(NAME_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(_NAME_CACHE, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"자산명 캐시 저장 실패: {str(e)}")
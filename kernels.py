@@ -0,0 +1,67 @@
+"""
+수치 계산 커널 모듈 - 백테스팅 통계를 Numba로 컴파일한 함수를 제공합니다.
+"""
+
+import numpy as np
+from numba import njit, types
+
+# 일간 수익률 표준편차 -> 연율화 변동성(%) 변환 계수 (거래일 252일 기준)
+VOLATILITY_SCALE = 252 ** 0.5 * 100
+
+
+# 쓰기 가능/읽기 전용(pandas Copy-on-Write) 연속 float32/float64 배열
+_STATS_SIGNATURES = [
+    types.UniTuple(types.float64, 2)(types.Array(dtype, 1, "C", readonly=readonly))
+    for dtype in (types.float32, types.float64)
+    for readonly in (False, True)
+]
+
+
+# 시그니처를 명시해 임포트 시점에 컴파일 (첫 API 요청의 컴파일 지연 제거)
+@njit(_STATS_SIGNATURES, cache=True, fastmath=True)
+def price_stats(closes):
+    """
+    종가 배열을 한 번만 순회하며 최대 낙폭(MDD)과 연율화 변동성을 계산합니다.
+    종가에 NaN이 없어야 합니다. 입력이 float32여도 누적은 float64로 합니다.
+
+    Args:
+        closes: 연속된 float32/float64 종가 배열
+
+    Returns:
+        (최대 낙폭 %, 연율화 변동성 %) 튜플
+    """
+    # 수익률을 계산할 수 없는 짧은 구간
+    n = closes.shape[0]
+    if n < 2:
+        return 0.0, 0.0
+
+    peak = np.float64(closes[0])
+    min_drawdown = 0.0
+
+    # 일간 수익률의 평균/분산을 Welford 방식으로 누적
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(1, n):
+        price = np.float64(closes[i])
+        prev = np.float64(closes[i - 1])
+
+        if price > peak:
+            peak = price
+        drawdown = (price - peak) / peak
+        if drawdown < min_drawdown:
+            min_drawdown = drawdown
+
+        daily_return = (price - prev) / prev
+        count += 1
+        delta = daily_return - mean
+        mean += delta / count
+        m2 += delta * (daily_return - mean)
+
+    # 표본 표준편차 (pandas std와 동일하게 ddof=1)
+    volatility = 0.0
+    if count > 1:
+        volatility = (m2 / (count - 1)) ** 0.5 * VOLATILITY_SCALE
+
+    return min_drawdown * 100, volatility
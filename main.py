@@ -13,11 +13,13 @@ from typing import Dict, List, Any, Optional
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 from text_analyzer import TextAnalyzer
 from backtest import BacktestAnalyzer
+from data_provider import DataProvider
 
 # 환경 변수 로드
 load_dotenv()
@@ -30,20 +32,21 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # FastAPI 앱 설정
-app = FastAPI(title="종합 자산 백테스팅 API")
+# orjson으로 응답 직렬화 (NumPy 타입 직접 지원)
+app = FastAPI(title="종합 자산 백테스팅 API", default_response_class=ORJSONResponse)
 
 # CORS 설정 업데이트 (main.py 파일)
 app.add_middleware(
     CORSMiddleware,
-    # 여러 출처를 배열로 지정하여 모두 허용
-    allow_origins=[
+    # 여러 출처를 튜플로 지정하여 모두 허용 (요청마다 변경되지 않는 상수)
+    allow_origins=(
         "https://backtestai-two.vercel.app",  # Vercel 프로덕션 사이트
         "https://backtest.ai.kr",
         "http://localhost:3000",              # React 개발 서버 (CRA)
         "http://localhost:5173",              # Vite 개발 서버
         "http://127.0.0.1:3000",              # 로컬 개발 대체 URL
         "http://127.0.0.1:5173"               # 로컬 개발 대체 URL
-    ],
+    ),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -72,11 +75,8 @@ async def natural_backtest(request: NaturalBacktestRequest):
         user_prompt = request.prompt
         logger.info(f"자연어 백테스팅 요청: '{user_prompt}'")
         
-        # 텍스트 분석기 초기화
-        text_analyzer = TextAnalyzer()
-        
-        # LLM으로 매개변수 추출
-        analysis_result = await text_analyzer.analyze_backtest_request(user_prompt)
+        # LLM으로 매개변수 추출 (시작 시 생성한 공유 분석기 사용)
+        analysis_result = await app.state.text_analyzer.analyze_backtest_request(user_prompt)
         
         if analysis_result["status"] != "success":
             return {
@@ -123,13 +123,13 @@ async def natural_backtest(request: NaturalBacktestRequest):
         if backtest_result["status"] == "success":
             BacktestAnalyzer.print_backtest_result(backtest_result)
         
-        # 응답 생성
-        return {
+        # 응답 생성 (jsonable_encoder를 거치지 않고 orjson으로 바로 직렬화)
+        return ORJSONResponse({
             "status": "success" if backtest_result["status"] == "success" else "error",
             "request": user_prompt,
             "parameters": params,
             "result": backtest_result
-        }
+        })
     
     except Exception as e:
         logger.error(f"백테스팅 처리 중 오류: {str(e)}")
@@ -162,20 +162,63 @@ async def backtest_asset(
             asset_type=asset_type
         )
         
-        return result
+        # jsonable_encoder를 거치지 않고 orjson으로 바로 직렬화
+        return ORJSONResponse(result)
     
     except Exception as e:
         logger.error(f"백테스팅 처리 중 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"백테스팅 처리 중 오류가 발생했습니다: {str(e)}")
 
+@app.post("/backtest/stream")
+async def backtest_asset_stream(
+    symbol: str = Query(..., description="자산 심볼/코드"),
+    start_date: str = Query(..., description="시작일 (YYYY-MM-DD)"),
+    end_date: str = Query(None, description="종료일 (YYYY-MM-DD)"),
+    investment_amount: float = Query(1000000, description="투자 금액 (원)"),
+    asset_type: str = Query(None, description="자산 유형 (stock/crypto/commodity/etf)")
+):
+    """
+    지정된 자산에 대한 백테스팅 결과를 NDJSON으로 스트리밍합니다.
+    첫 줄은 요약 결과, 이후 각 줄은 daily_data의 하루치 데이터입니다.
+    """
+    logger.info(f"백테스팅 스트리밍 요청: {symbol} ({start_date} ~ {end_date})")
+    
+    # 종료일 기본값 설정 (현재)
+    if not end_date:
+        end_date = datetime.now().strftime("%Y-%m-%d")
+    
+    return StreamingResponse(
+        BacktestAnalyzer.stream_backtest_asset(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            investment_amount=investment_amount,
+            asset_type=asset_type
+        ),
+        media_type="application/x-ndjson"
+    )
+
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 초기화"""
     logger.info("종합 자산 백테스팅 API 시작")
+    DataProvider.load_name_cache()
+    DataProvider.purge_price_cache()
+    
+    # 텍스트 분석기는 상태가 없으므로 한 번만 생성해 모든 요청에서 공유
+    app.state.text_analyzer = TextAnalyzer()
+    
     logger.info("예시 요청: curl -X POST http://localhost:8001/natural-backtest -H 'Content-Type: application/json' -d '{\"prompt\": \"삼성전자를 3개월 전에 100만원어치 샀다면 지금 얼마가 되었을까?\"}'")
     logger.info("예시 요청: curl -X POST http://localhost:8001/natural-backtest -H 'Content-Type: application/json' -d '{\"prompt\": \"금을 1년 전에 투자했다면 수익이 얼마나 났을까요?\"}'")
     logger.info("예시 요청: curl -X POST http://localhost:8001/natural-backtest -H 'Content-Type: application/json' -d '{\"prompt\": \"비트코인 6개월 전 500만원 투자 성과는?\"}'")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 정리"""
+    DataProvider.save_name_cache()
+    await DataProvider.close()
+    logger.info("종합 자산 백테스팅 API 종료")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8010, reload=True)
\ No newline at end of file